@@ -0,0 +1,181 @@
+import json
+from typing import Any, Dict, Iterable, TextIO
+from check import find_orphaned_checkouts
+from models import BookManager, UserManager, CheckoutManager
+from stats import CirculationStats
+from storage import Storage
+
+class BatchRunner:
+    """
+    Executes library commands non-interactively against a single loaded state.
+
+    Each input line is a JSON object naming an operation in "op" plus its fields, e.g.
+    {"op": "add_book", "title": "Dune", "author": "Frank Herbert", "isbn": "9780441013593"}.
+    An optional "id" is echoed back in the result. Blank lines and lines starting with '#' are skipped.
+
+    Attributes:
+        storage (Storage): The storage handler shared by all managers.
+        book_manager (BookManager): Manager used for book operations.
+        user_manager (UserManager): Manager used for user operations.
+        checkout_manager (CheckoutManager): Manager used for checkout operations.
+        stats (CirculationStats): Statistics kept up to date by the managers.
+    """
+    def __init__(self, storage: Storage) -> None:
+        self.storage = storage
+        self.stats = CirculationStats.from_data(storage.data)
+        self.book_manager = BookManager(storage, self.stats)
+        self.user_manager = UserManager(storage, self.stats)
+        self.checkout_manager = CheckoutManager(storage, self.user_manager, self.book_manager, self.stats)
+        self.commands = {
+            "add_book": self._add_book,
+            "list_books": self._list_books,
+            "find_book": self._find_book,
+            "find_books_by_author": self._find_books_by_author,
+            "remove_book": self._remove_book,
+            "add_user": self._add_user,
+            "list_users": self._list_users,
+            "get_user": self._get_user,
+            "remove_user": self._remove_user,
+            "checkout_book": self._checkout_book,
+            "list_checkouts": self._list_checkouts,
+            "find_checkout": self._find_checkout,
+            "fsck": self._fsck,
+            "stats": self._stats,
+            "rebuild_stats": self._rebuild_stats,
+        }
+
+    def execute(self, command: Dict[str, Any]) -> Any:
+        """
+        Executes a single command.
+
+        Args:
+            command (dict): The decoded command, with the operation name under "op".
+
+        Returns:
+            The JSON-serialisable result of the operation, or None if it has no result.
+
+        Raises:
+            ValueError: If the command is malformed or names an unknown operation.
+        """
+        if not isinstance(command, dict):
+            raise ValueError("Command must be a JSON object.")
+        op = command.get("op")
+        if op not in self.commands:
+            raise ValueError(f"Unknown operation: {op!r}.")
+        return self.commands[op](command)
+
+    def run(self, lines: Iterable[str], out: TextIO) -> int:
+        """
+        Executes every command in lines, writing one JSON result per command to out.
+
+        All mutations are saved to storage once, after the last command.
+
+        Args:
+            lines (iterable): JSON encoded commands, one per line.
+            out (TextIO): Stream that receives the JSON encoded results.
+
+        Returns:
+            int: The number of commands that failed.
+        """
+        failures = 0
+        with self.storage.deferred_save():
+            for line_number, line in enumerate(lines, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                result = {"line": line_number}
+                try:
+                    command = json.loads(line)
+                    if isinstance(command, dict) and "id" in command:
+                        result["id"] = command["id"]
+                    value = self.execute(command)
+                    result["ok"] = True
+                    result["result"] = value
+                except (ValueError, LookupError, TypeError) as e:
+                    failures += 1
+                    result["ok"] = False
+                    result["error"] = str(e.args[0]) if e.args else str(e)
+                out.write(json.dumps(result) + "\n")
+        return failures
+
+    @staticmethod
+    def _field(command: Dict[str, Any], name: str) -> str:
+        """Returns a required string field of a command, raising ValueError if it is missing or not a string."""
+        if name not in command:
+            raise ValueError(f"Missing field {name!r} for operation {command['op']!r}.")
+        if not isinstance(command[name], str):
+            raise ValueError(f"Field {name!r} for operation {command['op']!r} must be a string.")
+        return command[name]
+
+    @staticmethod
+    def _flag(command: Dict[str, Any], name: str) -> bool:
+        """Returns an optional boolean field of a command, raising ValueError if it is not a JSON boolean."""
+        value = command.get(name, False)
+        if not isinstance(value, bool):
+            raise ValueError(f"Field {name!r} for operation {command['op']!r} must be true or false.")
+        return value
+
+    @staticmethod
+    def _int(command: Dict[str, Any], name: str, default: int) -> int:
+        """Returns an optional non-negative integer field of a command, raising ValueError if it is anything else."""
+        value = command.get(name, default)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"Field {name!r} for operation {command['op']!r} must be a non-negative integer.")
+        return value
+
+    def _add_book(self, command: Dict[str, Any]) -> None:
+        self.book_manager.add_book(self._field(command, "title"), self._field(command, "author"), self._field(command, "isbn"))
+
+    def _list_books(self, command: Dict[str, Any]) -> list:
+        return [{"title": book.title, "author": book.author, "isbn": book.isbn} for book in self.book_manager.books.values()]
+
+    def _find_book(self, command: Dict[str, Any]) -> dict:
+        book = self.book_manager.find_book_by_isbn(self._field(command, "isbn"))
+        return {"title": book.title, "author": book.author, "isbn": book.isbn}
+
+    def _find_books_by_author(self, command: Dict[str, Any]) -> list:
+        return [{"title": book.title, "author": book.author, "isbn": book.isbn} for book in self.book_manager.find_books_by_author(self._field(command, "author"))]
+
+    def _remove_book(self, command: Dict[str, Any]) -> None:
+        self.book_manager.remove_book_by_isbn(self._field(command, "isbn"), cascade=self._flag(command, "cascade"))
+
+    def _add_user(self, command: Dict[str, Any]) -> None:
+        self.user_manager.add_user(self._field(command, "name"), self._field(command, "user_id"))
+
+    def _list_users(self, command: Dict[str, Any]) -> list:
+        return [{"name": user.name, "user_id": user.user_id} for user in self.user_manager.users.values()]
+
+    def _get_user(self, command: Dict[str, Any]) -> dict:
+        user = self.user_manager.get_user(self._field(command, "user_id"))
+        return {"name": user.name, "user_id": user.user_id}
+
+    def _remove_user(self, command: Dict[str, Any]) -> None:
+        self.user_manager.remove_user(self._field(command, "user_id"), cascade=self._flag(command, "cascade"))
+
+    def _checkout_book(self, command: Dict[str, Any]) -> None:
+        self.checkout_manager.checkout_book(self._field(command, "user_id"), self._field(command, "isbn"))
+
+    def _list_checkouts(self, command: Dict[str, Any]) -> list:
+        return [{"user_id": checkout.user_id, "isbn": checkout.isbn} for checkout in self.checkout_manager.checkouts.values()]
+
+    def _find_checkout(self, command: Dict[str, Any]) -> dict:
+        checkout = self.checkout_manager.find_checkout(self._field(command, "isbn"))
+        return {"user_id": checkout.user_id, "isbn": checkout.isbn}
+
+    def _fsck(self, command: Dict[str, Any]) -> dict:
+        orphans = find_orphaned_checkouts(self.storage.data)
+        repair = self._flag(command, "repair")
+        if repair:
+            self.checkout_manager.remove_checkouts([orphan["isbn"] for orphan in orphans])
+        return {"orphaned_checkouts": orphans, "repaired": repair}
+
+    def _stats(self, command: Dict[str, Any]) -> dict:
+        return self.stats.summary(self._int(command, "k", 10))
+
+    def _rebuild_stats(self, command: Dict[str, Any]) -> dict:
+        k = self._int(command, "k", 10)
+        rebuilt = CirculationStats.from_data(self.storage.data)
+        consistent = self.stats.matches(rebuilt)
+        if not consistent:
+            self.stats = self.book_manager.stats = self.user_manager.stats = self.checkout_manager.stats = rebuilt
+        return {"consistent": consistent, "stats": rebuilt.summary(k)}
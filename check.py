@@ -1,4 +1,6 @@
 import re
+from typing import Any, Dict, List
+
 class Checkout:
     """Represents a single book checkout in the library system."""
     
@@ -19,4 +21,31 @@ class Checkout:
     
     def __str__(self):
         return f"Checkout(User ID: {self.user_id}, ISBN: {self.isbn})"
-    
+
+
+def find_orphaned_checkouts(data: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Finds checkouts that reference a book or user which no longer exists.
+
+    The book ISBNs and user IDs are collected into sets first, so the whole check is a
+    single pass over each collection.
+
+    Args:
+        data (dict): The raw storage data with "books", "users" and "checkouts" lists.
+
+    Returns:
+        list: One dictionary per orphaned checkout with its "user_id", "isbn" and the
+        names of the "missing" references ("book" and/or "user").
+    """
+    isbns = {book["isbn"] for book in data.get("books", [])}
+    user_ids = {user["user_id"] for user in data.get("users", [])}
+    orphans = []
+    for checkout in data.get("checkouts", []):
+        missing = []
+        if checkout["isbn"] not in isbns:
+            missing.append("book")
+        if checkout["user_id"] not in user_ids:
+            missing.append("user")
+        if missing:
+            orphans.append({"user_id": checkout["user_id"], "isbn": checkout["isbn"], "missing": missing})
+    return orphans
@@ -1,30 +1,56 @@
+import argparse
+import sys
+from batch import BatchRunner
+from check import find_orphaned_checkouts
 from models import BookManager, UserManager, CheckoutManager
+from replica import ReplicaStorage
+from sharded_storage import ShardedStorage
 from storage import Storage
 
-def main_menu():
-    print("\nLibrary Management System")
-    print("1. Add Book")
-    print("2. List Books")
-    print("3. Find Book by ISBN")
-    print("4. Remove Book by ISBN")
-    print("5. Add User")
-    print("6. List Users")
-    print("7. Find User by User ID")
-    print("8. Remove User by User ID")
-    print("9. Checkout Book")
-    print("10. List Checkouts")
-    print("11. Exit")
+# Menu choices that change data, hidden and refused on a read-only replica
+WRITE_CHOICES = {'1', '4', '5', '8', '9'}
+
+def main_menu(read_only: bool = False):
+    print("\nLibrary Management System" + (" (read-only replica)" if read_only else ""))
+    options = [
+        ('1', "Add Book"),
+        ('2', "List Books"),
+        ('3', "Find Book by ISBN"),
+        ('4', "Remove Book by ISBN"),
+        ('5', "Add User"),
+        ('6', "List Users"),
+        ('7', "Find User by User ID"),
+        ('8', "Remove User by User ID"),
+        ('9', "Checkout Book"),
+        ('10', "List Checkouts"),
+        ('11', "Exit"),
+    ]
+    for number, label in options:
+        if not (read_only and number in WRITE_CHOICES):
+            print(f"{number}. {label}")
     choice = input("Enter choice: ")
     return choice
 
-def main():
-    storage = Storage("library_data.json")
+def main(storage: Storage = None):
+    if storage is None:
+        storage = Storage("library_data.json")
     book_manager = BookManager(storage)
     user_manager = UserManager(storage)
-    checkout_manager = CheckoutManager(storage)
+    checkout_manager = CheckoutManager(storage, user_manager, book_manager)
+    read_only = isinstance(storage, ReplicaStorage)
+    if read_only:
+        storage.attach(checkout_manager)
 
     while True:
-        choice = main_menu()
+        choice = main_menu(read_only)
+        if read_only:
+            # Catch up with the primary between commands, on this thread, so nothing changes under a lookup
+            try:
+                storage.poll()
+            except (ValueError, LookupError) as e:
+                print(f"Error: could not follow the change log: {e}")
+            if choice in WRITE_CHOICES:
+                choice = None  # Falls through to "Invalid choice"
         try:
             if choice == '1':
                 title = input("Enter title: ")
@@ -70,5 +96,48 @@ def main():
         except (ValueError, LookupError, KeyError, TypeError) as e:
             print(f"Error: {e}")  # Enhanced error message clarity
 
+def run_batch(path: str, storage: Storage) -> int:
+    """Runs the commands in path ('-' for stdin) and returns the process exit code."""
+    runner = BatchRunner(storage)
+    if path == "-":
+        failures = runner.run(sys.stdin, sys.stdout)
+    else:
+        with open(path, 'r') as file:
+            failures = runner.run(file, sys.stdout)
+    return 1 if failures else 0
+
+def run_fsck(storage: Storage, repair: bool) -> int:
+    """Reports checkouts referencing missing books or users, optionally removing them, and returns the exit code."""
+    orphans = find_orphaned_checkouts(storage.data)
+    for orphan in orphans:
+        print(f" * Orphaned checkout - ISBN: {orphan['isbn']}, User ID: {orphan['user_id']} (missing {' and '.join(orphan['missing'])})")
+    print(f"{len(orphans)} orphaned checkout(s) found.")
+    if orphans and repair:
+        storage.remove_entries("checkouts", [orphan["isbn"] for orphan in orphans], "isbn")
+        print("Orphaned checkouts removed.")
+        return 0
+    return 1 if orphans else 0
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Library Management System")
+    parser.add_argument("--batch", metavar="FILE", help="run JSON line commands from FILE ('-' for stdin) instead of the interactive menu")
+    parser.add_argument("--storage-dir", metavar="DIR", help="use hash-sharded storage in DIR instead of library_data.json")
+    parser.add_argument("--shards", type=int, default=16, help="number of shards per collection for --storage-dir (default: 16)")
+    parser.add_argument("--fsck", action="store_true", help="check for checkouts referencing missing books or users and exit")
+    parser.add_argument("--repair", action="store_true", help="with --fsck, remove the orphaned checkouts")
+    parser.add_argument("--change-log", metavar="FILE", help="record every change to FILE so that replicas can follow it")
+    parser.add_argument("--replica", metavar="FILE", help="run read-only, following the change log FILE of a primary")
+    args = parser.parse_args()
+    if args.repair and args.replica:
+        parser.error("--repair cannot be used with --replica; repair the primary instead")
+    if args.replica:
+        storage = ReplicaStorage(args.replica)
+    elif args.storage_dir:
+        storage = ShardedStorage(args.storage_dir, args.shards, change_log=args.change_log)
+    else:
+        storage = Storage("library_data.json", args.change_log)
+    if args.fsck:
+        sys.exit(run_fsck(storage, args.repair))
+    if args.batch:
+        sys.exit(run_batch(args.batch, storage))
+    main(storage)
@@ -1,19 +1,27 @@
+from typing import List
 from book import Book
+from catalog import BookCatalog
 from check import Checkout
 from user import User
 from storage import Storage
+from stats import CirculationStats
 
 class BookManager:
     """
     Manages a collection of books in a library.
     
     Attributes:
-        books (dict): A dictionary storing Book instances, keyed by ISBN.
+        books (BookCatalog): A columnar mapping of Book instances, keyed by ISBN. Each books[isbn]
+            returns a new Book built from the columns, so changes made to a returned Book are lost.
         storage (Storage): The storage handler for persistence.
+        checkout_manager (CheckoutManager): Set by a CheckoutManager built on this manager, used to guard removals.
+        stats (CirculationStats): Optional statistics updated on every change.
     """
-    def __init__(self, storage: Storage):
-        self.books = {}  # Dictionary for efficient book access by ISBN
+    def __init__(self, storage: Storage, stats: CirculationStats = None):
+        self.books = BookCatalog()  # Columnar mapping for compact storage and efficient book access by ISBN
         self.storage = storage
+        self.checkout_manager = None
+        self.stats = stats
         self._load_books()
 
     def _load_books(self) -> None:
@@ -39,8 +47,10 @@ class BookManager:
         if isbn in self.books:
             raise ValueError("A book with the same ISBN already exists.")
         book = Book(title, author, isbn)
+        self.storage.add_book(book)  # Storage first, so a rejected write leaves memory unchanged
         self.books[isbn] = book
-        self.storage.add_book(book)
+        if self.stats is not None:
+            self.stats.book_added(book.author)
 
     def list_books(self) -> None:
         """Lists all the books in the collection."""
@@ -65,19 +75,39 @@ class BookManager:
         except KeyError:
             raise LookupError("No book found with the specified ISBN.")
 
-    def remove_book_by_isbn(self, isbn: str) -> None:
+    def find_books_by_author(self, author: str) -> List[Book]:
+        """
+        Finds all books by an author.
+
+        Args:
+            author (str): The exact name of the author.
+
+        Returns:
+            list: The books by the author, empty if there are none.
+        """
+        return self.books.find_by_author(author)
+
+    def remove_book_by_isbn(self, isbn: str, cascade: bool = False) -> None:
         """
         Removes a book by its ISBN from the collection.
 
         Args:
             isbn (str): The ISBN of the book to remove.
+            cascade (bool): Whether to also remove the book's checkout instead of refusing the removal.
 
         Raises:
             LookupError: If no book with the specified ISBN exists.
+            ValueError: If the book is checked out and cascade is False.
         """
         if isbn in self.books:
-            del self.books[isbn]
+            if self.checkout_manager is not None and isbn in self.checkout_manager.checkouts:
+                if not cascade:
+                    raise ValueError("This book is currently checked out.")
+                self.checkout_manager.remove_checkouts([isbn])
             self.storage.remove_entry("books", isbn, "isbn")
+            book = self.books.pop(isbn)
+            if self.stats is not None:
+                self.stats.book_removed(book.author)
         else:
             raise LookupError("No book found with the specified ISBN to remove.")
 
@@ -85,11 +115,17 @@ class BookManager:
 class CheckoutManager:
     """Manages book checkouts in the library system."""
     
-    def __init__(self, storage: Storage):
+    def __init__(self, storage: Storage, user_manager: "UserManager" = None, book_manager: BookManager = None,
+                 stats: CirculationStats = None):
         self.checkouts = {}  # Dictionary to track checkouts by ISBN
+        self.user_checkouts = {}  # ISBNs checked out by each user, so removals need no scan
         self.storage = storage
-        self.user_manager = UserManager(storage)
-        self.book_manager = BookManager(storage)
+        self.stats = stats
+        # Reuse the caller's managers when given so that all of them see the same in-memory state
+        self.user_manager = user_manager if user_manager is not None else UserManager(storage, stats)
+        self.book_manager = book_manager if book_manager is not None else BookManager(storage, stats)
+        self.user_manager.checkout_manager = self
+        self.book_manager.checkout_manager = self
         self._load_checkouts()
 
     def _load_checkouts(self) -> None:
@@ -97,6 +133,7 @@ class CheckoutManager:
         checkouts = self.storage.get_checkouts()
         for checkout in checkouts:
             self.checkouts[checkout.isbn] = checkout
+            self.user_checkouts.setdefault(checkout.user_id, set()).add(checkout.isbn)
     
     def list_checkouts(self) -> None:
         """Lists all the checkouts in the system."""
@@ -123,12 +160,14 @@ class CheckoutManager:
             raise ValueError("This book is already checked out.")
         # These methods will raise KeyError if the user or book does not exist.
         self.user_manager.get_user(user_id)  # Validate user existence
-        self.book_manager.find_book_by_isbn(isbn)  # Validate book existence
+        book = self.book_manager.find_book_by_isbn(isbn)  # Validate book existence
         # If the above checks pass then the user and books are present in the database and the book is not checked out
         checkout = Checkout(user_id, isbn)
-        self.checkouts[isbn] = checkout
         self.storage.add_checkout(checkout)
-        print(f"Book {isbn} checked out to user {user_id}.")
+        self.checkouts[isbn] = checkout
+        self.user_checkouts.setdefault(user_id, set()).add(isbn)
+        if self.stats is not None:
+            self.stats.checkout_added(user_id, isbn, book.title)
 
     def find_checkout(self, isbn: str) -> Checkout:
         """Finds which user has checked out a book by ISBN.
@@ -146,6 +185,26 @@ class CheckoutManager:
             raise KeyError("This book is not checked out.")
         return self.checkouts[isbn]
 
+    def remove_checkouts(self, isbns: List[str]) -> None:
+        """Removes the checkouts of the given ISBNs, with a single storage update.
+
+        Args:
+            isbns (list): The ISBNs whose checkouts should be removed. ISBNs that are not checked out are ignored.
+        """
+        removed = list(dict.fromkeys(isbn for isbn in isbns if isbn in self.checkouts))
+        if not removed:
+            return
+        self.storage.remove_entries("checkouts", removed, "isbn")
+        for isbn in removed:
+            checkout = self.checkouts.pop(isbn)
+            user_isbns = self.user_checkouts.get(checkout.user_id)
+            if user_isbns is not None:
+                user_isbns.discard(isbn)
+                if not user_isbns:
+                    del self.user_checkouts[checkout.user_id]
+            if self.stats is not None:
+                self.stats.checkout_removed(checkout.user_id, isbn)
+
 
 class UserManager:
     """
@@ -154,10 +213,14 @@ class UserManager:
     Attributes:
         users (dict): A dictionary storing User instances, keyed by user ID.
         storage (Storage): The storage handler for persistence.
+        checkout_manager (CheckoutManager): Set by a CheckoutManager built on this manager, used to guard removals.
+        stats (CirculationStats): Optional statistics updated on every change.
     """
-    def __init__(self, storage: Storage):
+    def __init__(self, storage: Storage, stats: CirculationStats = None):
         self.users = {}  # Dictionary for efficient user fetching
         self.storage = storage
+        self.checkout_manager = None
+        self.stats = stats
         self._load_users()
 
     def _load_users(self) -> None:
@@ -182,8 +245,10 @@ class UserManager:
         if user_id in self.users:
             raise ValueError("A user with this ID already exists.")
         user = User(name, user_id)
-        self.users[user_id] = user
         self.storage.add_user(user)
+        self.users[user_id] = user
+        if self.stats is not None:
+            self.stats.user_added()
 
     def get_user(self, user_id: str) -> User:
         """
@@ -210,18 +275,26 @@ class UserManager:
         for user in self.users.values():
             print(" * ", user)
 
-    def remove_user(self, user_id: str) -> None:
+    def remove_user(self, user_id: str, cascade: bool = False) -> None:
         """
         Removes a user by their user_id from the collection.
 
         Args:
             user_id (str): The user_id of the user to remove.
+            cascade (bool): Whether to also remove the user's checkouts instead of refusing the removal.
 
         Raises:
             KeyError: If no user with the specified user_id exists.
+            ValueError: If the user has books checked out and cascade is False.
         """
         if user_id in self.users:
-            del self.users[user_id]
+            if self.checkout_manager is not None and self.checkout_manager.user_checkouts.get(user_id):
+                if not cascade:
+                    raise ValueError("This user still has books checked out.")
+                self.checkout_manager.remove_checkouts(list(self.checkout_manager.user_checkouts[user_id]))
             self.storage.remove_entry("users", user_id, "user_id")
+            del self.users[user_id]
+            if self.stats is not None:
+                self.stats.user_removed()
         else:
             raise KeyError("No user found with the specified user ID to remove.")
@@ -0,0 +1,157 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List
+from book import Book
+from check import Checkout
+from user import User
+from models import BookManager, UserManager, CheckoutManager
+from storage import ID_FIELDS, Storage
+
+# Enough of a log file to cover the opening of its snapshot record, including the log ID
+_HEAD_SIZE = 64
+
+class ReplicaStorage(Storage):
+    """
+    Read-only storage that follows a primary's change log instead of reading its data file.
+
+    The log is replayed once on construction, starting from the snapshot the primary
+    wrote when it opened the log. Each call to poll() then applies only the records
+    appended since the previous call, to the data and to every attached manager.
+    poll() must be called from the thread that reads the managers, e.g. between
+    commands, since the managers' collections are not safe to change under a reader.
+
+    Attributes:
+        file_path (str): The path of the primary's change log.
+        sequence (int): The sequence number of the last applied change.
+        managers (list): The managers kept up to date by poll().
+    """
+
+    def __init__(self, change_log: str) -> None:
+        self._offset = 0  # Bytes of the change log already applied
+        self._log_id = None  # Inode and head of the log file being followed
+        self.managers = []
+        super().__init__(change_log)
+        self.poll()
+
+    def load_data(self) -> Dict[str, Any]:
+        """Starts from empty collections, the snapshot at the head of the change log fills them in."""
+        return {key: [] for key in ID_FIELDS}
+
+    def save_data(self) -> None:
+        """Replicas never write; all changes must be made on the primary."""
+        raise ValueError("Replica storage is read-only.")
+
+    def _insert(self, key: str, entry: Dict[str, Any]) -> None:
+        raise ValueError("Replica storage is read-only.")
+
+    def remove_entries(self, key: str, entry_ids: Iterable[str], id_field: str) -> None:
+        raise ValueError("Replica storage is read-only.")
+
+    def attach(self, manager) -> None:
+        """
+        Keeps a manager's in-memory collection in step with the change log.
+
+        A CheckoutManager's user and book managers are attached along with it.
+
+        Args:
+            manager: A BookManager, UserManager or CheckoutManager built on this storage.
+        """
+        managers = [manager]
+        if isinstance(manager, CheckoutManager):
+            managers += [manager.user_manager, manager.book_manager]
+        for manager in managers:
+            if not any(manager is attached for attached in self.managers):
+                self.managers.append(manager)
+
+    def poll(self) -> int:
+        """
+        Applies the change records appended to the log since the last poll.
+
+        Only complete lines are consumed, so a record the primary is still writing is
+        picked up by the next poll.
+
+        Returns:
+            int: The number of records applied.
+        """
+        try:
+            file = open(self.file_path, 'rb')
+        except FileNotFoundError:
+            return 0
+        with file:
+            status = os.fstat(file.fileno())
+            log_id = (status.st_dev, status.st_ino, file.read(_HEAD_SIZE))
+            # A reopened primary replaces the log with a new file whose numbering may restart,
+            # so replay it from its snapshot. The head holds the snapshot's random log ID, which
+            # also catches a recreated file that was given the old inode.
+            if log_id != self._log_id or status.st_size < self._offset:
+                self._log_id = log_id
+                self._offset = 0
+                self.sequence = -1
+            file.seek(self._offset)
+            chunk = file.read()
+        end = chunk.rfind(b"\n") + 1
+        applied = 0
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            change = json.loads(line)
+            if change["seq"] <= self.sequence:
+                continue
+            self._apply(change)
+            self.sequence = change["seq"]
+            applied += 1
+        self._offset += end
+        return applied
+
+    def _apply(self, change: Dict[str, Any]) -> None:
+        """Applies a single change record to the data and the attached managers."""
+        if change["op"] == "snapshot":
+            self.data = {key: list(change["data"].get(key, [])) for key in ID_FIELDS}
+            for manager in self.managers:
+                self._reset_manager(manager)
+            for key, entries in self.data.items():
+                self._apply_to_managers(key, entries, [])
+        elif change["op"] == "insert":
+            self.data[change["key"]].append(change["entry"])
+            self._apply_to_managers(change["key"], [change["entry"]], [])
+        elif change["op"] == "remove":
+            id_field = ID_FIELDS[change["key"]]
+            removed_ids = {entry[id_field] for entry in change["entries"]}
+            self.data[change["key"]] = [entry for entry in self.data[change["key"]] if entry[id_field] not in removed_ids]
+            self._apply_to_managers(change["key"], [], change["entries"])
+        else:
+            raise ValueError(f"Unknown change record: {change['op']!r}.")
+
+    @staticmethod
+    def _reset_manager(manager) -> None:
+        if isinstance(manager, BookManager):
+            manager.books.clear()
+        elif isinstance(manager, UserManager):
+            manager.users.clear()
+        elif isinstance(manager, CheckoutManager):
+            manager.checkouts.clear()
+            manager.user_checkouts.clear()
+
+    def _apply_to_managers(self, key: str, added: List[Dict[str, Any]], removed: List[Dict[str, Any]]) -> None:
+        for manager in self.managers:
+            if key == "books" and isinstance(manager, BookManager):
+                for entry in removed:
+                    manager.books.pop(entry["isbn"], None)
+                for entry in added:
+                    manager.books[entry["isbn"]] = Book(entry["title"], entry["author"], entry["isbn"])
+            elif key == "users" and isinstance(manager, UserManager):
+                for entry in removed:
+                    manager.users.pop(entry["user_id"], None)
+                for entry in added:
+                    manager.users[entry["user_id"]] = User(entry["name"], entry["user_id"])
+            elif key == "checkouts" and isinstance(manager, CheckoutManager):
+                for entry in removed:
+                    manager.checkouts.pop(entry["isbn"], None)
+                    user_isbns = manager.user_checkouts.get(entry["user_id"])
+                    if user_isbns is not None:
+                        user_isbns.discard(entry["isbn"])
+                        if not user_isbns:
+                            del manager.user_checkouts[entry["user_id"]]
+                for entry in added:
+                    manager.checkouts[entry["isbn"]] = Checkout(entry["user_id"], entry["isbn"])
+                    manager.user_checkouts.setdefault(entry["user_id"], set()).add(entry["isbn"])
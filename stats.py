@@ -0,0 +1,183 @@
+from typing import Any, Dict, Hashable, List, Tuple
+
+class RankedCounter:
+    """
+    Counts keys and lists the highest counts without sorting.
+
+    Keys are grouped into buckets by count and the non-empty buckets are linked in
+    count order, so incrementing or decrementing a key is O(1) and reading the top K
+    keys is O(K).
+
+    Attributes:
+        counts (dict): The current count of every key with a count above zero.
+    """
+    def __init__(self) -> None:
+        self.counts = {}
+        self._buckets = {}  # Count -> keys with that count, a dict is used as an insertion ordered set
+        # Links between non-empty counts. 0 is the head and None the tail of the list.
+        self._higher = {0: None}
+        self._lower = {None: 0}
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __getitem__(self, key: Hashable) -> int:
+        return self.counts.get(key, 0)
+
+    def _link(self, count: int, after: int) -> None:
+        following = self._higher[after]
+        self._higher[after] = count
+        self._higher[count] = following
+        self._lower[count] = after
+        self._lower[following] = count
+        self._buckets[count] = {}
+
+    def _unlink(self, count: int) -> None:
+        previous = self._lower.pop(count)
+        following = self._higher.pop(count)
+        self._higher[previous] = following
+        self._lower[following] = previous
+        del self._buckets[count]
+
+    def _move(self, key: Hashable, old: int, new: int) -> None:
+        if new > 0:
+            if new not in self._buckets:
+                self._link(new, old if new > old else self._lower[old])
+            self._buckets[new][key] = None
+            self.counts[key] = new
+        else:
+            del self.counts[key]
+        if old > 0:
+            del self._buckets[old][key]
+            if not self._buckets[old]:
+                self._unlink(old)
+
+    def increment(self, key: Hashable) -> None:
+        """Adds one to the count of key."""
+        count = self.counts.get(key, 0)
+        self._move(key, count, count + 1)
+
+    def decrement(self, key: Hashable) -> None:
+        """
+        Subtracts one from the count of key, dropping it once the count reaches zero.
+
+        Raises:
+            KeyError: If key has no count.
+        """
+        count = self.counts[key]
+        self._move(key, count, count - 1)
+
+    def top(self, k: int) -> List[Tuple[Hashable, int]]:
+        """
+        Returns up to k (key, count) pairs with the highest counts, highest first.
+
+        Keys with equal counts are listed in the order they reached that count.
+        """
+        result = []
+        count = self._lower[None]
+        while count != 0 and len(result) < k:
+            for key in self._buckets[count]:
+                if len(result) == k:
+                    break
+                result.append((key, count))
+            count = self._lower[count]
+        return result
+
+
+class CirculationStats:
+    """
+    Circulation figures maintained incrementally by the managers.
+
+    Every figure describes the current state of the library, so it can always be
+    verified against a rebuild from the stored data.
+
+    Attributes:
+        book_count (int): Number of books in the collection.
+        user_count (int): Number of registered users.
+        checkout_count (int): Number of books currently checked out.
+        books_per_author (RankedCounter): Number of books by each author.
+        checkouts_per_user (RankedCounter): Number of books each user has checked out.
+        checkouts_per_title (RankedCounter): Number of checked out copies of each title.
+    """
+    def __init__(self) -> None:
+        self.book_count = 0
+        self.user_count = 0
+        self.checkout_count = 0
+        self.books_per_author = RankedCounter()
+        self.checkouts_per_user = RankedCounter()
+        self.checkouts_per_title = RankedCounter()
+        self._checkout_titles = {}  # ISBN -> title of each checkout, so a checkout can be removed after its book
+
+    @classmethod
+    def from_data(cls, data: Dict[str, List[Dict[str, Any]]]) -> "CirculationStats":
+        """
+        Builds the statistics from scratch with a single pass over the stored data.
+
+        Args:
+            data (dict): The raw storage data with "books", "users" and "checkouts" lists.
+
+        Returns:
+            CirculationStats: The computed statistics.
+        """
+        stats = cls()
+        titles = {}
+        for book in data.get("books", []):
+            stats.book_count += 1
+            stats.books_per_author.increment(book["author"])
+            titles[book["isbn"]] = book["title"]
+        stats.user_count = len(data.get("users", []))
+        for checkout in data.get("checkouts", []):
+            stats.checkout_added(checkout["user_id"], checkout["isbn"], titles.get(checkout["isbn"]))
+        return stats
+
+    def book_added(self, author: str) -> None:
+        self.book_count += 1
+        self.books_per_author.increment(author)
+
+    def book_removed(self, author: str) -> None:
+        self.book_count -= 1
+        self.books_per_author.decrement(author)
+
+    def user_added(self) -> None:
+        self.user_count += 1
+
+    def user_removed(self) -> None:
+        self.user_count -= 1
+
+    def checkout_added(self, user_id: str, isbn: str, title: str) -> None:
+        self.checkout_count += 1
+        self.checkouts_per_user.increment(user_id)
+        if title is not None:  # Orphaned checkouts have no title to count
+            self._checkout_titles[isbn] = title
+            self.checkouts_per_title.increment(title)
+
+    def checkout_removed(self, user_id: str, isbn: str) -> None:
+        self.checkout_count -= 1
+        self.checkouts_per_user.decrement(user_id)
+        title = self._checkout_titles.pop(isbn, None)
+        if title is not None:
+            self.checkouts_per_title.decrement(title)
+
+    def summary(self, k: int = 10) -> Dict[str, Any]:
+        """
+        Returns the figures as a JSON-serialisable dictionary in O(k).
+
+        Args:
+            k (int): The number of entries in each ranking.
+        """
+        return {
+            "books": self.book_count,
+            "users": self.user_count,
+            "checkouts": self.checkout_count,
+            "authors": len(self.books_per_author),
+            "top_authors": [[author, count] for author, count in self.books_per_author.top(k)],
+            "top_borrowers": [[user_id, count] for user_id, count in self.checkouts_per_user.top(k)],
+            "most_checked_out_titles": [[title, count] for title, count in self.checkouts_per_title.top(k)],
+        }
+
+    def matches(self, other: "CirculationStats") -> bool:
+        """Returns True if both hold the same figures, regardless of the order ties were reached in."""
+        return (self.book_count, self.user_count, self.checkout_count) == (other.book_count, other.user_count, other.checkout_count) \
+            and self.books_per_author.counts == other.books_per_author.counts \
+            and self.checkouts_per_user.counts == other.checkouts_per_user.counts \
+            and self.checkouts_per_title.counts == other.checkouts_per_title.counts
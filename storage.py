@@ -1,21 +1,63 @@
 import json
 import os
-from typing import Dict, Any, List
+import re
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, List, Optional
 from book import Book
 from user import User
 from check import Checkout
 
+# Field that uniquely identifies an entry in each collection
+ID_FIELDS = {"books": "isbn", "users": "user_id", "checkouts": "isbn"}
+
+# A record ends with its sequence number, since _record_change adds "seq" as the last key.
+# Newlines inside JSON strings are escaped, so a raw newline only ever ends a record.
+_SEQUENCE_END = re.compile(rb'"seq": (\d+)\}\n')
+
+def _last_sequence(path: str) -> int:
+    """
+    Returns the sequence number of the last complete record in a change log.
+
+    The file is searched backwards in fixed-size blocks for the end of a record, so
+    only the tail is read, however long the last record (e.g. a snapshot) is.
+    """
+    with open(path, 'rb') as file:
+        file.seek(0, os.SEEK_END)
+        position = file.tell()
+        carry = b""  # Start of the later block, in case a record end spans two blocks
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            file.seek(position)
+            block = file.read(step) + carry
+            matches = list(_SEQUENCE_END.finditer(block))
+            if matches:
+                return int(matches[-1].group(1))
+            carry = block[:32]
+    return -1
+
 class Storage:
     """
     Manages the storage and retrieval of data to and from a JSON file.
 
     Attributes:
         file_path (str): The path to the JSON file used for storage.
+        change_log_path (str): Optional path of a JSON lines file receiving one sequence-numbered
+            record per mutation, which replicas tail (see replica.py).
+        sequence (int): The sequence number of the last recorded change.
     """
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, change_log: Optional[str] = None) -> None:
         self.file_path = file_path
-        self.data = self.load_data()
+        self._load()
+        self._deferred = False  # True while inside deferred_save(), mutations only mark the data dirty
+        self._dirty = False
+        self.change_log_path = change_log
+        self.sequence = -1
+        self._pending_changes = []  # Change records waiting for the next save
+        if change_log is not None:
+            self._open_change_log()
 
     def load_data(self) -> Dict[str, Any]:
         """
@@ -34,6 +76,19 @@ class Storage:
         except Exception as e:
             raise Exception(f"An error occurred while loading data: {e}")
 
+    def _load(self) -> None:
+        """Loads the data and indexes its IDs."""
+        self.data = self.load_data()
+        self._index_ids()
+
+    def _index_ids(self) -> None:
+        """Collects the IDs of each collection into a set, so duplicate checks need no scan."""
+        self._ids = {key: {entry[id_field] for entry in self.data.get(key, [])} for key, id_field in ID_FIELDS.items()}
+
+    def _contains(self, key: str, entry_id: str) -> bool:
+        """Returns True if the collection holds an entry with the given ID."""
+        return entry_id in self._ids[key]
+
     def save_data(self) -> None:
         """
         Saves the current state of data to the JSON file.
@@ -44,6 +99,93 @@ class Storage:
         except Exception as e:
             raise Exception(f"An error occurred while saving data: {e}")
 
+    def _open_change_log(self) -> None:
+        """
+        Starts the change log afresh with a snapshot of the data.
+
+        The data file may have changed since the log was last written, e.g. by a run
+        without a change log, so an existing log is replaced rather than appended to.
+        Numbering continues from its last complete record, and any incomplete record
+        left by a crash is dropped with the old file. The new file is swapped in
+        atomically, which is how replicas notice that they must replay it.
+        """
+        if os.path.exists(self.change_log_path):
+            self.sequence = _last_sequence(self.change_log_path)
+        # The snapshot lets a replica bootstrap from the log alone
+        # A random ID at the head of the file tells replicas apart from an earlier log at the same path
+        self._record_change({"op": "snapshot", "log_id": uuid.uuid4().hex, "data": self.data})
+        temp_path = self.change_log_path + ".tmp"
+        try:
+            with open(temp_path, 'w') as file:
+                file.write(json.dumps(self._pending_changes.pop()) + "\n")
+            os.replace(temp_path, self.change_log_path)
+        except Exception as e:
+            raise Exception(f"An error occurred while writing the change log: {e}")
+
+    def _record_change(self, change: Dict[str, Any]) -> None:
+        """Numbers a change record and queues it for the change log."""
+        if self.change_log_path is None:
+            return
+        self.sequence += 1
+        self._pending_changes.append(dict(change, seq=self.sequence))
+
+    def _flush_changes(self) -> None:
+        """Appends the queued change records to the change log."""
+        if not self._pending_changes:
+            return
+        try:
+            with open(self.change_log_path, 'a') as file:
+                file.write("".join(json.dumps(change) + "\n" for change in self._pending_changes))
+        except Exception as e:
+            raise Exception(f"An error occurred while writing the change log: {e}")
+        self._pending_changes = []
+
+    def _persist(self) -> None:
+        """Saves the data, then publishes its changes so replicas never run ahead of the saved state."""
+        self.save_data()
+        self._flush_changes()
+
+    def _commit(self) -> None:
+        """Persists a mutation immediately, or marks the data dirty while saves are deferred."""
+        if self._deferred:
+            self._dirty = True
+        else:
+            self._persist()
+
+    def _insert(self, key: str, entry: Dict[str, Any]) -> None:
+        """
+        Appends an entry to the data and persists it.
+
+        Args:
+            key (str): The collection the entry belongs to.
+            entry (dict): The serialised entry.
+        """
+        self.data[key].append(entry)
+        self._ids[key].add(entry[ID_FIELDS[key]])
+        self._record_change({"op": "insert", "key": key, "entry": entry})
+        self._commit()
+
+    @contextmanager
+    def deferred_save(self):
+        """
+        Defers all saves until the block exits, then writes the file once if anything changed.
+
+        The data is saved even if the block raises, so mutations applied before the
+        error are not lost.
+        """
+        if self._deferred:  # Nested blocks are folded into the outermost one
+            yield self
+            return
+        self._deferred = True
+        self._dirty = False
+        try:
+            yield self
+        finally:
+            self._deferred = False
+            if self._dirty:
+                self._dirty = False
+                self._persist()
+
     def add_book(self, book: Book) -> None:
         """
         Adds a book to the storage.
@@ -51,14 +193,13 @@ class Storage:
         Args:
             book (Book): The book to add.
         """
-        if any(book_dict['isbn'] == book.isbn for book_dict in self.data["books"]):
+        if self._contains("books", book.isbn):
             raise ValueError("A book with this ISBN already exists.")
-        self.data["books"].append({
+        self._insert("books", {
             "title": book.title,
             "author": book.author,
             "isbn": book.isbn
         })
-        self.save_data()
 
     def get_books(self) -> List[Book]:
         """
@@ -76,13 +217,12 @@ class Storage:
         Args:
             user (User): The user to add.
         """
-        if any(user_dict['user_id'] == user.user_id for user_dict in self.data["users"]):
+        if self._contains("users", user.user_id):
             raise ValueError("A user with this user ID already exists.")
-        self.data["users"].append({
+        self._insert("users", {
             "name": user.name,
             "user_id": user.user_id
         })
-        self.save_data()
 
     def get_users(self) -> List[User]:
         """
@@ -100,13 +240,12 @@ class Storage:
         Args:
             checkout (Checkout): The checkout to add.
         """
-        if any(checkout_dict['isbn'] == checkout.isbn for checkout_dict in self.data["checkouts"]):
+        if self._contains("checkouts", checkout.isbn):
             raise ValueError("This book is already checked out.")
-        self.data["checkouts"].append({
+        self._insert("checkouts", {
             "user_id": checkout.user_id,
             "isbn": checkout.isbn
         })
-        self.save_data()
 
     def get_checkouts(self) -> List[Checkout]:
         """
@@ -126,8 +265,29 @@ class Storage:
             entry_id (str): The ID of the entry to remove.
             id_field (str): The field that contains the ID in the entry.
         """
-        self.data[key] = [entry for entry in self.data[key] if entry[id_field] != entry_id]
-        self.save_data()
+        self.remove_entries(key, [entry_id], id_field)
+
+    def remove_entries(self, key: str, entry_ids: Iterable[str], id_field: str) -> None:
+        """
+        Removes several entries from the data in a single pass.
+
+        Args:
+            key (str): The key under which the entries are to be removed.
+            entry_ids (iterable): The IDs of the entries to remove.
+            id_field (str): The field that contains the ID in the entry.
+        """
+        entry_ids = set(entry_ids)
+        if not entry_ids:
+            return
+        kept, removed = [], []
+        for entry in self.data[key]:
+            (removed if entry[id_field] in entry_ids else kept).append(entry)
+        self.data[key] = kept
+        for entry in removed:
+            self._ids[key].discard(entry[ID_FIELDS[key]])
+        if removed:
+            self._record_change({"op": "remove", "key": key, "entries": removed})
+        self._commit()
 
 # Example usage
 if __name__ == "__main__":
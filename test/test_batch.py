@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from batch import BatchRunner
+from storage import Storage
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        """Create a BatchRunner backed by a storage file in a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "library_data.json")
+        self.storage = Storage(self.path)
+        self.runner = BatchRunner(self.storage)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_commands(self, commands):
+        """Run the given commands and return the failure count and decoded results."""
+        out = io.StringIO()
+        failures = self.runner.run([json.dumps(command) for command in commands], out)
+        return failures, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_run_success(self):
+        """Test a book added, checked out and listed within one batch."""
+        failures, results = self.run_commands([
+            {"op": "add_book", "title": "Python Programming", "author": "John Doe", "isbn": "1234567890"},
+            {"op": "add_user", "name": "Jane Doe", "user_id": "001"},
+            {"op": "checkout_book", "user_id": "001", "isbn": "1234567890", "id": "co-1"},
+            {"op": "list_checkouts"},
+        ])
+        self.assertEqual(failures, 0)
+        self.assertTrue(all(result["ok"] for result in results))
+        self.assertEqual(results[2]["id"], "co-1")
+        self.assertEqual(results[3]["result"], [{"user_id": "001", "isbn": "1234567890"}])
+
+    def test_run_saves_once(self):
+        """Test that a batch writes the storage file a single time."""
+        with patch.object(Storage, "save_data", autospec=True, side_effect=Storage.save_data) as save:
+            self.run_commands([
+                {"op": "add_user", "name": "John Doe", "user_id": str(i)} for i in range(1, 50)
+            ])
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(len(Storage(self.path).get_users()), 49)
+
+    def test_run_reports_errors(self):
+        """Test that failing commands are reported without stopping the batch."""
+        out = io.StringIO()
+        failures = self.runner.run([
+            "not json",
+            json.dumps({"op": "unknown"}),
+            json.dumps({"op": "find_book", "isbn": "9999999999"}),
+            json.dumps({"op": "add_book", "title": "Python Programming"}),
+            json.dumps({"op": "add_book", "title": 5, "author": "John Doe", "isbn": "1234567890"}),
+            "",
+            json.dumps({"op": "add_user", "name": "John Doe", "user_id": "001"}),
+        ], out)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(failures, 5)
+        self.assertEqual([result["ok"] for result in results], [False, False, False, False, False, True])
+        self.assertEqual(results[-1]["line"], 7)
+        self.assertIn("001", Storage(self.path).data["users"][0]["user_id"])
+
+    def test_fsck_repair(self):
+        """Test that fsck reports and removes checkouts whose book and user no longer exist."""
+        self.storage.data["checkouts"].append({"user_id": "042", "isbn": "1234567890"})
+        self.runner = BatchRunner(self.storage)
+        failures, results = self.run_commands([{"op": "fsck", "repair": True}, {"op": "fsck"}])
+        self.assertEqual(failures, 0)
+        self.assertEqual(results[0]["result"]["orphaned_checkouts"], [{"user_id": "042", "isbn": "1234567890", "missing": ["book", "user"]}])
+        self.assertEqual(results[1]["result"]["orphaned_checkouts"], [])
+        self.assertEqual(Storage(self.path).data["checkouts"], [])
+
+    def test_flags_must_be_booleans(self):
+        """Test that a non-boolean cascade or repair flag is rejected without removing anything."""
+        failures, results = self.run_commands([
+            {"op": "add_book", "title": "Python Programming", "author": "John Doe", "isbn": "1234567890"},
+            {"op": "add_user", "name": "Jane Doe", "user_id": "001"},
+            {"op": "checkout_book", "user_id": "001", "isbn": "1234567890"},
+            {"op": "remove_user", "user_id": "001", "cascade": "false"},
+            {"op": "fsck", "repair": 1},
+        ])
+        self.assertEqual(failures, 2)
+        self.assertIn("001", self.runner.checkout_manager.user_checkouts)
+
+    def test_stats_consistent_with_rebuild(self):
+        """Test that the incrementally maintained statistics agree with a rebuild."""
+        failures, results = self.run_commands([
+            {"op": "add_book", "title": "Python Programming", "author": "John Doe", "isbn": "1234567890"},
+            {"op": "add_user", "name": "Jane Doe", "user_id": "001"},
+            {"op": "checkout_book", "user_id": "001", "isbn": "1234567890"},
+            {"op": "stats", "k": 1},
+            {"op": "rebuild_stats"},
+        ])
+        self.assertEqual(failures, 0)
+        self.assertEqual(results[3]["result"]["most_checked_out_titles"], [["Python Programming", 1]])
+        self.assertTrue(results[4]["result"]["consistent"])
+
+    def test_k_must_be_non_negative_integer(self):
+        """Test that stats rejects a k that is not a non-negative JSON integer."""
+        failures, results = self.run_commands([
+            {"op": "stats", "k": "3"},
+            {"op": "stats", "k": 2.5},
+            {"op": "stats", "k": True},
+            {"op": "stats", "k": -1},
+            {"op": "rebuild_stats", "k": "3"},
+            {"op": "stats", "k": 0},
+        ])
+        self.assertEqual(failures, 5)
+        self.assertEqual(results[0]["error"], "Field 'k' for operation 'stats' must be a non-negative integer.")
+        self.assertTrue(results[5]["ok"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from book import Book
+from catalog import BookCatalog
+
+class TestBookCatalog(unittest.TestCase):
+    def setUp(self):
+        """Create a catalog holding three books by two authors."""
+        self.catalog = BookCatalog()
+        for book in (Book("Python Programming", "John Doe", "1234567890"),
+                     Book("Advanced Python", "Jane Smith", "0987654321"),
+                     Book("Python Recipes", "John Doe", "9783161484100")):
+            self.catalog[book.isbn] = book
+
+    def test_lookup(self):
+        """Test that a stored book is returned with its fields."""
+        book = self.catalog["0987654321"]
+        self.assertEqual((book.title, book.author, book.isbn), ("Advanced Python", "Jane Smith", "0987654321"))
+        self.assertIn("0987654321", self.catalog)
+        self.assertEqual(len(self.catalog), 3)
+        with self.assertRaises(KeyError):
+            self.catalog["9999999999"]
+
+    def test_authors_encoded_once(self):
+        """Test that each distinct author name is stored once."""
+        self.assertEqual(self.catalog.authors, ["John Doe", "Jane Smith"])
+
+    def test_find_by_author(self):
+        """Test finding all books by an author."""
+        self.assertEqual(sorted(book.isbn for book in self.catalog.find_by_author("John Doe")), ["1234567890", "9783161484100"])
+        self.assertEqual(self.catalog.find_by_author("Nobody"), [])
+
+    def test_delete_keeps_rows_consistent(self):
+        """Test that removing a book leaves the remaining books intact and in order."""
+        del self.catalog["1234567890"]
+        self.assertNotIn("1234567890", self.catalog)
+        self.assertEqual(list(self.catalog), ["0987654321", "9783161484100"])
+        self.assertEqual(self.catalog["9783161484100"].title, "Python Recipes")
+        self.assertEqual([book.isbn for book in self.catalog.find_by_author("John Doe")], ["9783161484100"])
+
+    def test_values_and_items_follow_keys(self):
+        """Test that values and items read the columns in key order, also after a removal."""
+        del self.catalog["1234567890"]
+        self.catalog["1111111111"] = Book("Fluent Python", "Luciano Ramalho", "1111111111")
+        self.assertEqual([book.isbn for book in self.catalog.values()], list(self.catalog))
+        self.assertEqual([(isbn, book.title) for isbn, book in self.catalog.items()],
+                         [("0987654321", "Advanced Python"), ("9783161484100", "Python Recipes"), ("1111111111", "Fluent Python")])
+        self.assertEqual(len(self.catalog.values()), 3)
+
+    def test_author_rows_follow_updates_and_removals(self):
+        """Test that changing a book's author and moving rows on removal keep author lookups correct."""
+        self.catalog["0987654321"] = Book("Advanced Python", "John Doe", "0987654321")
+        self.assertEqual(self.catalog.find_by_author("Jane Smith"), [])
+        del self.catalog["1234567890"]  # The last row moves into row 0
+        self.assertEqual(sorted(book.isbn for book in self.catalog.find_by_author("John Doe")), ["0987654321", "9783161484100"])
+        del self.catalog["9783161484100"]
+        self.assertEqual([book.title for book in self.catalog.find_by_author("John Doe")], ["Advanced Python"])
+
+    def test_clear_resets_authors(self):
+        """Test that clearing the catalog also drops its author table."""
+        self.catalog.clear()
+        self.assertEqual(len(self.catalog), 0)
+        self.assertEqual(self.catalog.authors, [])
+        self.catalog["0987654321"] = Book("Advanced Python", "Jane Smith", "0987654321")
+        self.assertEqual(self.catalog.authors, ["Jane Smith"])
+        self.assertEqual(self.catalog.find_by_author("John Doe"), [])
+
+    def test_key_must_match_isbn(self):
+        """Test storing a book under a different key should raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.catalog["1111111111"] = Book("Python Programming", "John Doe", "1234567890")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from check import Checkout
+from check import Checkout, find_orphaned_checkouts
 
 class TestCheckout(unittest.TestCase):
     def test_checkout_creation_success(self):
@@ -23,5 +23,27 @@ class TestCheckout(unittest.TestCase):
         checkout = Checkout("001", "9783161484100")
         self.assertEqual(str(checkout), "Checkout(User ID: 001, ISBN: 9783161484100)")
 
+
+class TestFindOrphanedCheckouts(unittest.TestCase):
+    def test_find_orphaned_checkouts(self):
+        """Test that checkouts with a missing book or user are reported."""
+        data = {
+            "books": [{"title": "Python Programming", "author": "John Doe", "isbn": "1234567890"}],
+            "users": [{"name": "Jane Doe", "user_id": "001"}],
+            "checkouts": [
+                {"user_id": "001", "isbn": "1234567890"},
+                {"user_id": "002", "isbn": "1234567890"},
+                {"user_id": "003", "isbn": "9783161484100"},
+            ],
+        }
+        self.assertEqual(find_orphaned_checkouts(data), [
+            {"user_id": "002", "isbn": "1234567890", "missing": ["user"]},
+            {"user_id": "003", "isbn": "9783161484100", "missing": ["book", "user"]},
+        ])
+
+    def test_find_orphaned_checkouts_none(self):
+        """Test that consistent data reports no orphans."""
+        self.assertEqual(find_orphaned_checkouts({"books": [], "users": [], "checkouts": []}), [])
+
 if __name__ == '__main__':
     unittest.main()
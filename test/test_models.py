@@ -65,6 +65,12 @@ class TestBookManager(unittest.TestCase):
         self.assertNotIn("1234567890", self.manager.books)
         self.mock_storage.remove_entry.assert_called_once()
 
+    def test_find_books_by_author(self):
+        """Test finding the books of an author."""
+        self.manager.add_book("Python Programming", "John Doe", "1234567890")
+        self.manager.add_book("Advanced Python", "Jane Smith", "0987654321")
+        self.assertEqual([book.isbn for book in self.manager.find_books_by_author("Jane Smith")], ["0987654321"])
+
     def test_remove_book_by_isbn_not_found(self):
         """Test removing a book by an ISBN that does not exist should raise LookupError."""
         with self.assertRaises(LookupError):
@@ -114,6 +120,27 @@ class TestCheckoutManager(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.manager.find_checkout("9783161484100")
 
+    def test_remove_checked_out_book(self):
+        """Test removing a checked out book should raise ValueError unless cascading."""
+        self.manager.checkout_book("001", "9783161484100")
+        with self.assertRaises(ValueError):
+            self.manager.book_manager.remove_book_by_isbn("9783161484100")
+        self.manager.book_manager.remove_book_by_isbn("9783161484100", cascade=True)
+        self.assertNotIn("9783161484100", self.manager.checkouts)
+        self.assertNotIn("001", self.manager.user_checkouts)
+        self.mock_storage.remove_entries.assert_called_once_with("checkouts", ["9783161484100"], "isbn")
+
+    def test_remove_user_with_checkouts(self):
+        """Test removing a user with checkouts should raise ValueError unless cascading."""
+        self.manager.book_manager.add_book("other_book", "test_author", "1234567890")
+        self.manager.checkout_book("001", "9783161484100")
+        self.manager.checkout_book("001", "1234567890")
+        with self.assertRaises(ValueError):
+            self.manager.user_manager.remove_user("001")
+        self.manager.user_manager.remove_user("001", cascade=True)
+        self.assertEqual(self.manager.checkouts, {})
+        self.assertNotIn("001", self.manager.user_manager.users)
+
 
 class TestUserManager(unittest.TestCase):
     def setUp(self):
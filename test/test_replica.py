@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+from models import BookManager, UserManager, CheckoutManager
+from replica import ReplicaStorage
+from storage import Storage
+
+class TestReplicaStorage(unittest.TestCase):
+    def setUp(self):
+        """Create a primary storage with a change log and some existing data."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.data_path = os.path.join(self.tmpdir.name, "library_data.json")
+        self.log_path = os.path.join(self.tmpdir.name, "changes.jsonl")
+        seed = Storage(self.data_path)
+        BookManager(seed).add_book("Python Programming", "John Doe", "1234567890")
+        self.primary = Storage(self.data_path, self.log_path)
+        self.book_manager = BookManager(self.primary)
+        self.user_manager = UserManager(self.primary)
+        self.checkout_manager = CheckoutManager(self.primary, self.user_manager, self.book_manager)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_replica(self):
+        """Create a replica with all managers attached."""
+        replica = ReplicaStorage(self.log_path)
+        checkout_manager = CheckoutManager(replica)
+        replica.attach(checkout_manager)
+        return replica, checkout_manager
+
+    def test_bootstrap_from_snapshot(self):
+        """Test that a replica starts with the data present when the log was created."""
+        replica, checkout_manager = self.make_replica()
+        self.assertEqual(replica.sequence, 0)
+        self.assertEqual(checkout_manager.book_manager.find_book_by_isbn("1234567890").title, "Python Programming")
+
+    def test_poll_applies_changes(self):
+        """Test that polling applies inserts and removals to the attached managers."""
+        replica, checkout_manager = self.make_replica()
+        self.user_manager.add_user("Jane Doe", "001")
+        self.checkout_manager.checkout_book("001", "1234567890")
+        self.assertEqual(replica.poll(), 2)
+        self.assertEqual(checkout_manager.find_checkout("1234567890").user_id, "001")
+        self.user_manager.remove_user("001", cascade=True)
+        self.assertEqual(replica.poll(), 2)
+        self.assertNotIn("001", checkout_manager.user_manager.users)
+        self.assertEqual(checkout_manager.checkouts, {})
+        self.assertEqual(replica.data["checkouts"], [])
+        self.assertEqual(replica.sequence, self.primary.sequence)
+
+    def test_deferred_changes_published_on_save(self):
+        """Test that changes made while saves are deferred reach replicas only after the save."""
+        replica, checkout_manager = self.make_replica()
+        with self.primary.deferred_save():
+            self.user_manager.add_user("Jane Doe", "001")
+            self.assertEqual(replica.poll(), 0)
+        self.assertEqual(replica.poll(), 1)
+        self.assertIn("001", checkout_manager.user_manager.users)
+
+    def test_primary_resumes_sequence(self):
+        """Test that a reopened primary continues the sequence numbers with a fresh snapshot."""
+        self.user_manager.add_user("Jane Doe", "001")
+        reopened = Storage(self.data_path, self.log_path)
+        self.assertEqual(reopened.sequence, self.primary.sequence + 1)
+        with open(self.log_path, 'r') as file:
+            self.assertEqual(len(file.readlines()), 1)
+
+    def test_primary_resumes_after_partial_record(self):
+        """Test that an incomplete last record, e.g. from a crash mid-write, is dropped when resuming."""
+        self.user_manager.add_user("Jane Doe", "001")
+        with open(self.log_path, 'a') as file:
+            file.write('{"op": "insert", "key": "us')
+        reopened = Storage(self.data_path, self.log_path)
+        self.assertEqual(reopened.sequence, self.primary.sequence + 1)
+        replica, checkout_manager = self.make_replica()
+        UserManager(reopened).add_user("John Doe", "002")
+        self.assertEqual(replica.poll(), 1)
+        self.assertEqual(sorted(checkout_manager.user_manager.users), ["001", "002"])
+
+    def test_replica_follows_recreated_log(self):
+        """Test that a replica replays a log that was deleted and recreated with restarted numbering."""
+        replica, checkout_manager = self.make_replica()
+        self.user_manager.add_user("Jane Doe", "001")
+        self.user_manager.add_user("John Doe", "002")
+        replica.poll()
+        os.remove(self.log_path)
+        primary = Storage(self.data_path, self.log_path)
+        self.assertEqual(primary.sequence, 0)
+        UserManager(primary).add_user("Max Doe", "003")
+        self.assertEqual(replica.poll(), 2)
+        self.assertEqual(sorted(checkout_manager.user_manager.users), ["001", "002", "003"])
+        self.assertEqual(replica.sequence, 1)
+
+    def test_changes_without_log_reach_replicas(self):
+        """Test that changes saved by a run without a change log reach replicas once the primary reopens with it."""
+        replica, checkout_manager = self.make_replica()
+        UserManager(Storage(self.data_path)).add_user("Jane Doe", "001")
+        replica.poll()
+        self.assertNotIn("001", checkout_manager.user_manager.users)
+        Storage(self.data_path, self.log_path)
+        replica.poll()
+        self.assertIn("001", checkout_manager.user_manager.users)
+        self.assertEqual(checkout_manager.book_manager.find_book_by_isbn("1234567890").title, "Python Programming")
+
+    def test_read_only(self):
+        """Test that writing through a replica should raise ValueError and leave the managers unchanged."""
+        replica, checkout_manager = self.make_replica()
+        self.user_manager.add_user("Jane Doe", "001")
+        replica.poll()
+        with self.assertRaises(ValueError):
+            checkout_manager.user_manager.add_user("John Doe", "002")
+        with self.assertRaises(ValueError):
+            checkout_manager.user_manager.remove_user("001")
+        with self.assertRaises(ValueError):
+            checkout_manager.book_manager.remove_book_by_isbn("1234567890")
+        with self.assertRaises(ValueError):
+            checkout_manager.checkout_book("001", "1234567890")
+        self.assertEqual(list(checkout_manager.user_manager.users), ["001"])
+        self.assertEqual(list(checkout_manager.book_manager.books), ["1234567890"])
+        self.assertEqual(checkout_manager.checkouts, {})
+        self.assertEqual(replica.data["users"], [{"name": "Jane Doe", "user_id": "001"}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from book import Book
+from check import Checkout
+from user import User
+from storage import Storage
+from sharded_storage import ShardedStorage, shard_index
+
+class TestShardedStorage(unittest.TestCase):
+    def setUp(self):
+        """Create a ShardedStorage in a temporary directory before each test."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmpdir.name, "shards")
+        self.storage = ShardedStorage(self.directory, shard_count=4)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """Test that books, users and checkouts survive a reload."""
+        self.storage.add_book(Book("Python Programming", "John Doe", "1234567890"))
+        self.storage.add_user(User("Jane Doe", "001"))
+        self.storage.add_checkout(Checkout("001", "1234567890"))
+        reloaded = ShardedStorage(self.directory, shard_count=4)
+        self.assertEqual([book.isbn for book in reloaded.get_books()], ["1234567890"])
+        self.assertEqual([user.user_id for user in reloaded.get_users()], ["001"])
+        self.assertEqual([checkout.isbn for checkout in reloaded.get_checkouts()], ["1234567890"])
+
+    def test_only_dirty_shards_rewritten(self):
+        """Test that saving rewrites only the shard holding the changed entry."""
+        with self.storage.deferred_save():
+            for i in range(20):
+                self.storage.add_user(User("John Doe", str(i)))
+        mtimes = {name: os.stat(os.path.join(self.directory, name)).st_mtime_ns for name in os.listdir(self.directory)}
+        for name in mtimes:
+            os.utime(os.path.join(self.directory, name), ns=(0, 0))
+        self.storage.remove_entry("users", "7", "user_id")
+        changed = [name for name in mtimes if os.stat(os.path.join(self.directory, name)).st_mtime_ns != 0]
+        self.assertEqual(changed, [f"users-{shard_index('7', 4):04d}.json"])
+        self.assertNotIn("7", [user.user_id for user in ShardedStorage(self.directory, shard_count=4).get_users()])
+
+    def test_shard_count_mismatch(self):
+        """Test that opening a directory with a different shard count should raise ValueError."""
+        self.storage.add_user(User("John Doe", "001"))
+        with self.assertRaises(ValueError):
+            ShardedStorage(self.directory, shard_count=8)
+
+    def test_process_pool_load(self):
+        """Test saving and loading shards with a process pool."""
+        storage = ShardedStorage(self.directory, shard_count=4, executor_class=ProcessPoolExecutor, max_workers=2)
+        with storage.deferred_save():
+            storage.add_book(Book("Python Programming", "John Doe", "1234567890"))
+            storage.add_user(User("Jane Doe", "001"))
+        reloaded = ShardedStorage(self.directory, shard_count=4, executor_class=ProcessPoolExecutor, max_workers=2)
+        self.assertEqual(len(reloaded.get_books()), 1)
+        self.assertEqual(len(reloaded.get_users()), 1)
+
+    def test_duplicate_rejected(self):
+        """Test adding an entry whose ID already exists in its shard should raise ValueError."""
+        self.storage.add_user(User("John Doe", "001"))
+        with self.assertRaises(ValueError):
+            self.storage.add_user(User("Jane Doe", "001"))
+        self.storage.remove_entry("users", "001", "user_id")
+        self.storage.add_user(User("Jane Doe", "001"))
+        self.assertEqual(self.storage.data["users"], [{"name": "Jane Doe", "user_id": "001"}])
+
+    def test_from_storage(self):
+        """Test copying an existing JSON file storage into shards."""
+        source = Storage(os.path.join(self.tmpdir.name, "library_data.json"))
+        source.add_book(Book("Python Programming", "John Doe", "1234567890"))
+        source.add_user(User("Jane Doe", "001"))
+        target = os.path.join(self.tmpdir.name, "migrated")
+        ShardedStorage.from_storage(source, target, shard_count=2)
+        reloaded = ShardedStorage(target, shard_count=2)
+        self.assertEqual(reloaded.data["books"], source.data["books"])
+        self.assertEqual(reloaded.data["users"], source.data["users"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+from unittest.mock import MagicMock
+from collections import Counter
+from models import CheckoutManager
+from stats import CirculationStats, RankedCounter
+from storage import Storage
+
+class TestRankedCounter(unittest.TestCase):
+    def test_top(self):
+        """Test that top returns the highest counts first."""
+        counter = RankedCounter()
+        for key in "abacabd":
+            counter.increment(key)
+        self.assertEqual(counter.top(2), [("a", 3), ("b", 2)])
+        self.assertEqual(counter.top(10), [("a", 3), ("b", 2), ("c", 1), ("d", 1)])
+
+    def test_decrement(self):
+        """Test that decrementing reorders keys and drops those reaching zero."""
+        counter = RankedCounter()
+        for key in "aab":
+            counter.increment(key)
+        counter.decrement("a")
+        counter.decrement("a")
+        self.assertEqual(counter.top(5), [("b", 1)])
+        self.assertEqual(counter["a"], 0)
+        with self.assertRaises(KeyError):
+            counter.decrement("a")
+
+    def test_matches_counter(self):
+        """Test a random sequence of updates against collections.Counter."""
+        rng = random.Random(7)
+        counter, expected = RankedCounter(), Counter()
+        for _ in range(2000):
+            key = rng.randrange(20)
+            if expected[key] and rng.random() < 0.4:
+                counter.decrement(key)
+                expected[key] -= 1
+            else:
+                counter.increment(key)
+                expected[key] += 1
+        expected = +expected
+        self.assertEqual(counter.counts, dict(expected))
+        self.assertEqual([count for _, count in counter.top(20)], sorted(expected.values(), reverse=True))
+
+
+class TestCirculationStats(unittest.TestCase):
+    def setUp(self):
+        """Create managers on a mocked storage that share one CirculationStats."""
+        self.mock_storage = MagicMock(Storage)
+        self.mock_storage.get_books.return_value = []
+        self.mock_storage.get_users.return_value = []
+        self.mock_storage.get_checkouts.return_value = []
+        self.stats = CirculationStats()
+        self.manager = CheckoutManager(self.mock_storage, stats=self.stats)
+        self.manager.user_manager.add_user("John Doe", "001")
+        self.manager.user_manager.add_user("Jane Doe", "002")
+        self.manager.book_manager.add_book("Python Programming", "John Doe", "1234567890")
+        self.manager.book_manager.add_book("Python Programming", "John Doe", "1234567891")
+        self.manager.book_manager.add_book("Advanced Python", "Jane Smith", "9783161484100")
+
+    def test_incremental_updates(self):
+        """Test that the figures follow checkouts and removals."""
+        self.manager.checkout_book("001", "1234567890")
+        self.manager.checkout_book("002", "1234567891")
+        self.manager.checkout_book("001", "9783161484100")
+        summary = self.stats.summary(1)
+        self.assertEqual((summary["books"], summary["users"], summary["checkouts"]), (3, 2, 3))
+        self.assertEqual(summary["top_authors"], [["John Doe", 2]])
+        self.assertEqual(summary["top_borrowers"], [["001", 2]])
+        self.assertEqual(summary["most_checked_out_titles"], [["Python Programming", 2]])
+        self.manager.user_manager.remove_user("001", cascade=True)
+        self.manager.book_manager.remove_book_by_isbn("1234567891", cascade=True)
+        summary = self.stats.summary()
+        self.assertEqual((summary["books"], summary["users"], summary["checkouts"]), (2, 1, 0))
+        self.assertEqual(summary["top_borrowers"], [])
+        self.assertEqual(summary["top_authors"], [["Jane Smith", 1], ["John Doe", 1]])
+
+    def test_from_data(self):
+        """Test that a rebuild from stored data matches the incremental figures."""
+        self.manager.checkout_book("001", "1234567890")
+        data = {
+            "books": [{"title": book.title, "author": book.author, "isbn": book.isbn} for book in self.manager.book_manager.books.values()],
+            "users": [{"name": user.name, "user_id": user.user_id} for user in self.manager.user_manager.users.values()],
+            "checkouts": [{"user_id": "001", "isbn": "1234567890"}],
+        }
+        self.assertTrue(self.stats.matches(CirculationStats.from_data(data)))
+        data["checkouts"] = []
+        self.assertFalse(self.stats.matches(CirculationStats.from_data(data)))
+
+if __name__ == '__main__':
+    unittest.main()